@@ -1,11 +1,96 @@
+import os
+import hmac
+import collections
+import json
+import hashlib
+import secrets
+import atexit
 import time
+import asyncio
 import logging
+import pathlib
+import tempfile
+import weakref
 import aiohttp
 
+try:
+    # orjson is optional, it speeds up decoding large responses such as the installations tree
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 _LOGGER = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Returned by _request when a conditional GET finds the data unchanged
+_NOT_MODIFIED = object()
+
+# Fragments of 401 error messages meaning the token itself was rejected (e.g. "Auth token is expired"),
+# as opposed to the security rules denying access ("Permission denied")
+_TOKEN_ERROR_MARKERS = ("expired", "auth token", "invalid")
+
+# Path of the writable properties of a device
+_DATA_PATH = "devices/{}/data".format
+
+# Firebase REST query values must be JSON-encoded, so the child key is wrapped in double quotes
+_ORDER_BY_USERID = '"userid"'
+
+# Default file where tokens are persisted between runs, overridable through the EQCONNECT_TOKEN_CACHE variable
+TOKEN_CACHE_PATH = "~/.cache/eqconnect.json"
+
+# PBKDF2 iterations used to tie the persisted tokens to the password without storing it
+PASSWORD_HASH_ITERATIONS = 100_000
+
+# Seconds before expiration at which the token is considered stale and refreshed in the background
+TOKEN_REFRESH_MARGIN = 300
+
+# Seconds for which GET responses are cached. Installations topology barely changes, device state does
+INSTALLATIONS_CACHE_TTL = 600
+DEVICE_CACHE_TTL = 2
+
+# Maximum number of device requests dispatched concurrently by get_devices
+MAX_CONCURRENT_REQUESTS = 20
+
+# Connection pool settings used by sessions created through API.create_session
+CONNECTION_LIMIT = 50
+CONNECTION_LIMIT_PER_HOST = 20
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 75
+
+def _decode_body(body):
+    """Decode a raw JSON response body. Firebase answers "null" for paths without data."""
+    return _json_loads(body) if body else None
+
+def _decode_result(result):
+    """Decode the raw body returned by _do_request, keeping failures, _NOT_MODIFIED and ETags as they are."""
+    if result is None or result is _NOT_MODIFIED:
+        return result
+    if isinstance(result, tuple):
+        return _decode_body(result[0]), result[1]
+    return _decode_body(result)
+
+def _overlaps(path, other):
+    """Whether two database paths are the same, or one is a parent of the other."""
+    return path == other or path.startswith(other + "/") or other.startswith(path + "/")
+
 class API:
-    def __init__(self, email, password, session: aiohttp.ClientSession):
+    def __init__(self, email, password, session: aiohttp.ClientSession, token_cache_path=TOKEN_CACHE_PATH):
+        """Create the API client on top of an existing aiohttp session.
+
+        Tokens are persisted to token_cache_path so that later runs can skip the password sign-in; pass None
+        to disable it. The default location can be changed through the EQCONNECT_TOKEN_CACHE variable.
+        Persisted tokens are only reused with the password they were obtained with (a salted hash of it is
+        stored alongside them), but reusing them bypasses the server-side password check.
+
+        The same session is used for both the authentication and the database hosts, and should be shared
+        by the whole application rather than created per call, so that connections and DNS lookups are
+        reused. Callers passing their own session should size its connector like API.create_session does,
+        so that concurrent requests (e.g. get_devices) reuse pooled TLS connections instead of opening new ones.
+        """
         self.email = email
         self.password = password
         self.session = session # Store the async session
@@ -19,9 +104,179 @@ class API:
         self.id_token = None
         self.uid = None
         self.token_expiration = 0
+        self._installations_query = None
+        if token_cache_path == TOKEN_CACHE_PATH:
+            token_cache_path = os.environ.get("EQCONNECT_TOKEN_CACHE", token_cache_path)
+        self._token_path = pathlib.Path(token_cache_path).expanduser() if token_cache_path else None
+        # (salt, hash) of the password, stored with the persisted tokens
+        self._password_verifier = None
+
+        # Token deadlines on the monotonic clock: refresh in the background after the first one, block after the second
+        self._refresh_after = 0
+        self._expires_at = 0
+
+        # Background token refresh state
+        self._refresh_task = None
+        # Created on first use, so that it belongs to the loop running the requests (Python < 3.10)
+        self._refresh_lock = None
+
+        # Task opening the database connection while authentication is in progress
+        self._warm_up_task = None
+
+        # Cached GET responses: (path, params) -> (monotonic expiry time, raw body, etag)
+        self._cache = {}
+
+        # GET requests currently in flight: (path, params, ...) -> (write generation when started, task)
+        self._inflight = {}
+
+        # Generation of the last completed write to each path, so responses fetched before it can be told apart.
+        # Entries older than every pending GET (counted by the generation they started at) are pruned
+        self._write_generation = 0
+        self._writes = {}
+        self._pending_gets = collections.Counter()
+
+        # Whether the devices collection turned out to be unreadable as a whole (see get_all_devices_bulk)
+        self._bulk_devices_unavailable = False
+
+        # Whether the session was created by API.create and must be closed by us
+        self._owns_session = False
+
+    @staticmethod
+    def create_session():
+        """Create an aiohttp session with a connection pool tuned for the Firebase endpoints."""
+        try:
+            # aiodns is optional, it resolves hosts without blocking a thread
+            import aiodns  # noqa: F401
+            resolver = aiohttp.AsyncResolver()
+        except (ImportError, RuntimeError):
+            # RuntimeError: aiodns needs a SelectorEventLoop, which is not the default on Windows
+            resolver = None
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            limit_per_host=CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            resolver=resolver,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    @classmethod
+    async def create(cls, email, password, token_cache_path=TOKEN_CACHE_PATH):
+        """Create an API client owning a tuned session. Call close() when done with it."""
+        api = cls(email, password, cls.create_session(), token_cache_path)
+        api._owns_session = True
+        return api
+
+    async def close(self):
+        """Close the session if it was created by API.create, and cancel any pending background task."""
+        for task in (self._refresh_task, self._warm_up_task):
+            if task is not None and not task.done():
+                task.cancel()
+        if self._owns_session:
+            await self.session.close()
+
+    def _read_token_cache(self):
+        """Return the tokens persisted by a previous run for this account, if any. Blocking."""
+        try:
+            with open(self._token_path, "rb") as f:
+                cached = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("email") != self.email:
+            return None
+
+        # Tokens obtained with another password must not authenticate this one
+        try:
+            salt, expected = cached["passwordSalt"], cached["passwordHash"]
+            password_hash = self._hash_password(bytes.fromhex(salt))
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not hmac.compare_digest(password_hash, expected):
+            return None
+        self._password_verifier = (salt, password_hash)
+        return cached
+
+    def _hash_password(self, salt):
+        """Return the hex PBKDF2 hash of the password with the given salt. Blocking (CPU-bound)."""
+        return hashlib.pbkdf2_hmac("sha256", self.password.encode(), salt, PASSWORD_HASH_ITERATIONS).hex()
+
+    def _write_token_cache(self, data):
+        """Atomically write the token cache file. Blocking."""
+        if self._password_verifier is None:
+            salt = secrets.token_bytes(16)
+            self._password_verifier = (salt.hex(), self._hash_password(salt))
+        data["passwordSalt"], data["passwordHash"] = self._password_verifier
+        try:
+            self._token_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._token_path.parent, prefix=".eqconnect-")
+            try:
+                # mkstemp already creates the file readable and writable by the owner only
+                with os.fdopen(fd, "wb") as f:
+                    payload = _json_dumps(data)
+                    f.write(payload.encode() if isinstance(payload, str) else payload)
+                os.replace(tmp_path, self._token_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            _LOGGER.warning("Could not persist token cache: %s", e)
+
+    async def _load_token_cache(self):
+        """Read the token cache file without blocking the event loop."""
+        if self._token_path is None:
+            return None
+        return await asyncio.get_running_loop().run_in_executor(None, self._read_token_cache)
+
+    async def _save_token_cache(self):
+        """Persist the tokens, without blocking the event loop, so the next run can skip the password sign-in."""
+        if self._token_path is None:
+            return
+        data = {
+            "email": self.email,
+            "localId": self.uid,
+            "idToken": self.id_token,
+            "refreshToken": self.user.get('refreshToken'),
+            "token_expiration": self.token_expiration,
+        }
+        await asyncio.get_running_loop().run_in_executor(None, self._write_token_cache, data)
+
+    async def _warm_up(self):
+        """Open a pooled TLS connection to the database so the first real request skips the handshake."""
+        try:
+            async with self.session.head(f"{self.database_url}/.json") as resp:
+                await resp.release()
+        except Exception as e:
+            _LOGGER.debug("Database connection warm-up failed: %s", e)
 
     async def authenticate(self):
-        """Authenticate with Google Identity Toolkit to get a token."""
+        """Authenticate with Google Identity Toolkit to get a token.
+
+        If tokens for this account and password were persisted by a previous run, the ID token is reused
+        while it is fresh, and otherwise the refresh token is used instead of the password sign-in, falling
+        back to the latter if the refresh fails. The password is then only checked locally against the
+        stored hash, not by the server.
+        """
+        if self._warm_up_task is None:
+            # Overlap the database handshake with the authentication round-trip
+            self._warm_up_task = asyncio.create_task(self._warm_up())
+
+        cached = await self._load_token_cache()
+        if cached and cached.get("refreshToken"):
+            self.user = {"email": self.email, "refreshToken": cached["refreshToken"]}
+            expires_in = cached.get("token_expiration", 0) - time.time()
+            if cached.get("idToken") and cached.get("localId") and expires_in > TOKEN_REFRESH_MARGIN:
+                self.user.update(idToken=cached["idToken"], localId=cached["localId"])
+                self.id_token = cached["idToken"]
+                self._set_uid(cached["localId"])
+                self._set_token_expiration(expires_in)
+                _LOGGER.info("Authenticated successfully using the cached token")
+                return self.user
+            # An outdated cached token is expected, so its failure is not an error
+            if await self._refresh_token(_LOGGER.debug):
+                _LOGGER.info("Authenticated successfully using the cached refresh token")
+                return self.user
+            self.user = None
+
         url = f"https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key={self.api_key}"
         payload = {
             "email": self.email,
@@ -30,37 +285,41 @@ class API:
         }
         
         try:
-            async with self.session.post(url, json=payload) as resp:
+            async with self.session.post(url, data=_json_dumps(payload), headers=_JSON_HEADERS) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
-                    _LOGGER.error(f"Auth failed: {resp.status} - {error_text}")
+                    _LOGGER.error("Auth failed: %s - %s", resp.status, error_text)
                     return None
                 
-                data = await resp.json()
+                data = await resp.json(loads=_json_loads)
                 
                 # Save the results exactly like Pyrebase did
                 self.user = data
                 self.id_token = data['idToken']
-                self.uid = data['localId']
-                expires_in = int(data.get('expiresIn', 3600))
-                self.token_expiration = time.time() + expires_in
+                self._set_uid(data['localId'])
+                self._set_token_expiration(int(data.get('expiresIn', 3600)))
+                await self._save_token_cache()
                 
                 _LOGGER.info("Authenticated successfully")
                 return self.user
 
         except Exception as e:
-            _LOGGER.error(f"Authentication exception: {e}")
+            _LOGGER.error("Authentication exception: %s", e)
             return None
 
     async def refresh_token(self):
         """Refresh the user's token using the saved refresh token."""
+        return await self._refresh_token(_LOGGER.error)
+
+    async def _refresh_token(self, log_failure):
+        """Refresh the token, reporting failures through the given logging function."""
         url = f"https://securetoken.googleapis.com/v1/token?key={self.api_key}"
         
         # We need the refresh token we got during login
-        refresh_token = self.user.get('refreshToken')
+        refresh_token = (self.user or {}).get('refreshToken')
         if not refresh_token:
-            _LOGGER.error("Cannot refresh token: No refresh token found.")
-            return
+            log_failure("Cannot refresh token: No refresh token found.")
+            return False
 
         payload = {
             "grant_type": "refresh_token",
@@ -68,57 +327,248 @@ class API:
         }
 
         try:
-            async with self.session.post(url, json=payload) as resp:
+            async with self.session.post(url, data=_json_dumps(payload), headers=_JSON_HEADERS) as resp:
                 if resp.status != 200:
-                    _LOGGER.error("Token refresh failed.")
-                    return
+                    log_failure("Token refresh failed.")
+                    return False
                 
-                data = await resp.json()
+                data = await resp.json(loads=_json_loads)
                 
                 # Update our local state
                 self.id_token = data['id_token'] # Note: Google returns 'id_token' here (underscore), not 'idToken'
                 self.user['idToken'] = data['id_token']
                 self.user['refreshToken'] = data['refresh_token'] # Update it for next time
+                self.user['localId'] = data.get('user_id', self.uid)
+                self._set_uid(self.user['localId'])
                 
-                expires_in = int(data.get('expires_in', 3600))
-                self.token_expiration = time.time() + expires_in
+                self._set_token_expiration(int(data.get('expires_in', 3600)))
+                await self._save_token_cache()
                 _LOGGER.info("Token refreshed successfully")
+                return True
 
         except Exception as e:
-            _LOGGER.error(f"Token refresh exception: {e}")
+            log_failure("Token refresh exception: %s", e)
+            return False
+
+    def _set_uid(self, uid):
+        """Store the user ID along with the installations query filtering on it."""
+        if uid == self.uid and self._installations_query is not None:
+            return
+        self.uid = uid
+        if uid is None:
+            self._installations_query = None
+            return
+        # Built once so that every installations request reuses the same (hashable, cacheable) parameters
+        self._installations_query = {"orderBy": _ORDER_BY_USERID, "equalTo": json.dumps(uid)}
+
+    def _set_token_expiration(self, expires_in):
+        """Record when the current token goes stale and when it expires."""
+        self.token_expiration = time.time() + expires_in
+        self._expires_at = time.monotonic() + expires_in
+        self._refresh_after = self._expires_at - TOKEN_REFRESH_MARGIN
+
+    def _get_refresh_lock(self):
+        """Return the lock serializing token refreshes, creating it inside the running loop."""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        return self._refresh_lock
+
+    async def _locked_refresh(self):
+        """Refresh the token unless another caller already did it while we waited for the lock."""
+        async with self._get_refresh_lock():
+            if time.monotonic() < self._refresh_after:
+                return
+            if not await self.refresh_token():
+                # Force the next request to block on a refresh instead of serving a stale token
+                self._refresh_after = self._expires_at = float("-inf")
+
+    async def _refresh_rejected_token(self, token):
+        """Refresh a token the server rejected, unless a concurrent request already replaced it."""
+        async with self._get_refresh_lock():
+            if self.id_token != token:
+                return
+            if not await self.refresh_token():
+                self._refresh_after = self._expires_at = float("-inf")
 
     async def ensure_token_valid(self):
-        """Check if token is expired (or close to it) and refresh if needed."""
-        # Refresh if token expires in less than 5 minutes (300 seconds)
-        if time.time() >= self.token_expiration - 300:
-            await self.refresh_token()
+        """Make sure the token can be used, refreshing it if needed.
 
-    async def _request(self, method, path, json_data=None, params=None):
-        """Internal helper to handle Firebase Database requests."""
+        The token is fresh until TOKEN_REFRESH_MARGIN seconds before expiration, stale afterwards and
+        expired once the expiration time is reached. Stale tokens are refreshed in the background while
+        the current token keeps being served; only expired tokens (or a failed refresh) block the caller.
+        """
+        now = time.monotonic()
+        if now < self._refresh_after:
+            return
+        if now >= self._expires_at:
+            await self._locked_refresh()
+        elif self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._locked_refresh())
+
+    async def _request(self, method, path, json_data=None, params=None, with_etag=False, etag=None, raw=False,
+                       log_failure=_LOGGER.error):
+        """Internal helper to handle Firebase Database requests.
+
+        Identical GET requests issued while one is already in flight share its response body, which every
+        caller decodes into its own objects. With raw=True the undecoded body is returned instead.
+        With with_etag=True the response is returned as a (data, etag) tuple, and passing the etag of a previous
+        response turns the request into a conditional GET returning _NOT_MODIFIED if the data did not change.
+        Failures are reported through log_failure, for callers expecting them.
+        """
+        if method != "GET":
+            try:
+                result = await self._do_request(method, path, json_data, params, with_etag, etag, log_failure)
+                return result if raw else _decode_result(result)
+            finally:
+                # Even a failed write may have reached the server, so cached copies are outdated either way
+                self._record_write(path)
+
+        key = (path, frozenset(params.items()) if params else frozenset(), with_etag, etag, log_failure)
+        inflight = self._inflight.get(key)
+        # Only join a request that started after the last write to an overlapping path
+        if inflight is not None and inflight[0] >= self._last_write(path):
+            task = inflight[1]
+        else:
+            task = asyncio.create_task(self._do_request(method, path, json_data, params, with_etag, etag, log_failure))
+            start = self._begin_get()
+            entry = self._inflight[key] = (start, task)
+
+            def forget(_):
+                self._end_get(start)
+                # A newer request may have replaced this one in the map
+                if self._inflight.get(key) is entry:
+                    del self._inflight[key]
+            task.add_done_callback(forget)
+        # Shield the shared request so a cancelled caller does not cancel it for the others
+        result = await asyncio.shield(task)
+        return result if raw else _decode_result(result)
+
+    async def _do_request(self, method, path, json_data=None, params=None, with_etag=False, etag=None,
+                          log_failure=_LOGGER.error):
+        """Perform a single Firebase Database request."""
         await self.ensure_token_valid()
+        _LOGGER.debug("Database request: %s %s", method, path)
 
         url = f"{self.database_url}/{path}.json"
-        
-        # 1. Start with the auth token
-        request_params = {"auth": self.id_token}
-        
-        # 2. Add any specific query parameters (like orderBy)
-        if params:
-            request_params.update(params)
 
         try:
             # Pass 'params' to aiohttp. It handles the ?key=value formatting automatically
-            async with self.session.request(method, url, json=json_data, params=request_params) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    _LOGGER.error(f"Request failed: {method} {path} - {resp.status} - {text}")
-                    return None
-                
-                return await resp.json()
+            body = None if json_data is None else _json_dumps(json_data)
+            headers = None if json_data is None else dict(_JSON_HEADERS)
+            if with_etag:
+                headers = headers or {}
+                headers["X-Firebase-ETag"] = "true"
+                if etag:
+                    headers["If-None-Match"] = etag
+
+            # Retry once if the token is rejected, since the server may consider it expired before we do.
+            # Other 401s (security rules denying access) are returned straight away
+            for retry in (False, True):
+                token = self.id_token
+
+                # 1. Start with the auth token
+                request_params = {"auth": token}
+
+                # 2. Add any specific query parameters (like orderBy)
+                if params:
+                    request_params.update(params)
+
+                async with self.session.request(method, url, data=body, headers=headers, params=request_params) as resp:
+                    if resp.status == 401 and not retry:
+                        text = await resp.text()
+                        if any(marker in text.lower() for marker in _TOKEN_ERROR_MARKERS):
+                            await self._refresh_rejected_token(token)
+                            continue
+                        log_failure("Request failed: %s %s - %s - %s", method, path, resp.status, text)
+                        return None
+                    if resp.status == 304 and etag:
+                        await resp.release()
+                        return _NOT_MODIFIED
+                    if resp.status != 200:
+                        text = await resp.text()
+                        log_failure("Request failed: %s %s - %s - %s", method, path, resp.status, text)
+                        return None
+
+                    # Decoding is left to the callers, see _decode_result
+                    data = await resp.read()
+                    if with_etag:
+                        return data, resp.headers.get("ETag")
+                    return data
         except Exception as e:
-            _LOGGER.error(f"Request exception: {e}")
+            log_failure("Request exception: %s", e)
             return None
 
+    async def _cached_get(self, path, ttl, params=None, revalidate=False):
+        """GET a database path, reusing the previous response if it is less than ttl seconds old.
+
+        The raw response body is cached and decoded again on every hit, so callers always receive their own
+        objects and may modify them freely.
+
+        With revalidate=True an expired response is revalidated with its ETag, so that unchanged data is
+        confirmed by the server without being downloaded again.
+        """
+        key = (path, tuple(sorted(params.items())) if params else ())
+        cached = self._cache.get(key)
+        if cached and time.monotonic() < cached[0]:
+            return _decode_body(cached[1])
+
+        # A write completing while the request is in flight makes its response unfit for caching
+        start = self._begin_get()
+        try:
+            if not revalidate:
+                body = await self._request("GET", path, params=params, raw=True)
+                etag = None
+            else:
+                result = await self._request("GET", path, params=params, with_etag=True, etag=cached and cached[2], raw=True)
+                if result is _NOT_MODIFIED:
+                    if self._last_write(path) <= start:
+                        self._cache[key] = (time.monotonic() + ttl, cached[1], cached[2])
+                    return _decode_body(cached[1])
+                body, etag = result if result is not None else (None, None)
+
+            if body is None:
+                return None
+            if self._last_write(path) <= start:
+                self._cache[key] = (time.monotonic() + ttl, body, etag)
+            return _decode_body(body)
+        finally:
+            self._end_get(start)
+
+    def _begin_get(self):
+        """Register a pending GET, returning the write generation it started at."""
+        start = self._write_generation
+        self._pending_gets[start] += 1
+        return start
+
+    def _end_get(self, start):
+        """Unregister a pending GET started at the given write generation."""
+        self._pending_gets[start] -= 1
+        if not self._pending_gets[start]:
+            del self._pending_gets[start]
+
+    def _last_write(self, path):
+        """Return the generation of the last completed write overlapping the given path."""
+        return max((generation for written, generation in self._writes.items() if _overlaps(written, path)), default=0)
+
+    def _record_write(self, path):
+        """Mark a path as written, dropping the cached responses it made outdated."""
+        self._write_generation += 1
+        self._writes[path] = self._write_generation
+        self.invalidate_cache(path)
+
+        # Writes no pending GET started before can no longer affect any of them
+        oldest = min(self._pending_gets, default=self._write_generation)
+        self._writes = {written: generation for written, generation in self._writes.items() if generation > oldest}
+
+    def invalidate_cache(self, path=None):
+        """Drop cached responses overlapping the given path (a parent or a child of it), or all of them."""
+        if path is None:
+            self._cache.clear()
+            return
+        for key in list(self._cache):
+            if _overlaps(key[0], path):
+                del self._cache[key]
+
     # --- GETTERS ---
 
     async def get_user_info(self):
@@ -127,50 +577,106 @@ class API:
 
     async def get_installations(self):
         """Retrieve installations associated with the user's UID (Server-Side Filter)."""
-        
+
         # Equivalent to Pyrebase:
         # .order_by_child("userid").equal_to(self.uid)
-        
-        # NOTE: Firebase REST requires the values to be JSON-encoded strings.
-        # This means we must wrap the keys and values in double quotes.
-        query_params = {
-            "orderBy": '"userid"',       # Must be '"userid"', not 'userid'
-            "equalTo": f'"{self.uid}"'   # Must be '"uid_value"', not 'uid_value'
-        }
+
+        if self._installations_query is None:
+            # Without a user ID the query would be unfiltered and download every installation
+            _LOGGER.error("Cannot fetch installations: not authenticated.")
+            return {}
 
         # This will now only return the specific records for this user
-        data = await self._request("GET", "installations2", params=query_params)
+        data = await self._cached_get("installations2", INSTALLATIONS_CACHE_TTL, params=self._installations_query, revalidate=True)
         
         if not data:
             return {}
             
         return data
 
+    async def get_zone(self, installation_id, zone_id):
+        """Retrieve a specific zone of an installation."""
+        return await self._request("GET", f"installations2/{installation_id}/zones/{zone_id}")
+
     async def get_device(self, device_id):
         """Retrieve specific device information."""
-        return await self._request("GET", f"devices/{device_id}")
+        return await self._cached_get(f"devices/{device_id}", DEVICE_CACHE_TTL)
+
+    @staticmethod
+    def _collect_device_ids(installations):
+        """Flatten the installations -> zones -> devices tree into a list of device IDs."""
+        return [
+            dev_id
+            for inst_data in installations.values()
+            for zone_data in inst_data.get("zones", {}).values()
+            for dev_id in zone_data.get("devices", {})
+        ]
+
+    async def get_device_ids(self):
+        """Retrieve the IDs of all devices associated with the user, from the cached installations tree.
+
+        Firebase does not allow shallow=true together with orderBy/equalTo, so the installations of the user
+        cannot be listed without downloading them; any shallow listing of zones and devices would only add
+        requests on top of that download.
+        """
+        return self._collect_device_ids(await self.get_installations())
 
     async def get_devices(self):
         """Retrieve all devices associated with the user."""
         _LOGGER.debug("Fetching devices for user.")
+
+        # Collect every device ID first so they can be fetched concurrently
+        device_ids = await self.get_device_ids()
+        if not device_ids:
+            return []
+
+        # Cap the number of simultaneous requests; they all share self.session's connection pool
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def fetch(dev_id):
+            async with semaphore:
+                return await self.get_device(dev_id)
+
+        results = await asyncio.gather(*(fetch(dev_id) for dev_id in device_ids), return_exceptions=True)
+
+        devices = []
+        for dev_id, device in zip(device_ids, results):
+            if isinstance(device, Exception):
+                _LOGGER.error("Fetching device %s failed: %s", dev_id, device)
+                continue
+            if device:
+                # Add the ID to the device object so we know which one it is
+                device['id'] = dev_id
+                devices.append(device)
+        return devices
+
+    async def get_all_devices_bulk(self):
+        """Retrieve all devices associated with the user using a single GET on the devices collection.
+
+        Only worth it when the devices collection is small, since the whole subtree is downloaded and
+        filtered client-side. Falls back to get_devices if the collection cannot be read in one go, which is
+        remembered so that later calls go straight to get_devices.
+        """
+        if self._bulk_devices_unavailable:
+            return await self.get_devices()
+
         installations = await self.get_installations()
         if not installations:
             return []
 
+        # Usually denied by the security rules, so a failure is expected rather than an error
+        all_devices = await self._request("GET", "devices", log_failure=_LOGGER.debug)
+        if all_devices is None:
+            _LOGGER.debug("Bulk device fetch unavailable, falling back to per-device requests.")
+            self._bulk_devices_unavailable = True
+            return await self.get_devices()
+
         devices = []
-        for inst_id, inst_data in installations.items():
-            zones = inst_data.get("zones", {})
-            for zone_id, zone_data in zones.items():
-                device_ids = zone_data.get("devices", {}).keys()
-                
-                # Optimization: We could fetch all devices in one go if the list is small,
-                # but following your old logic, we fetch one by one.
-                for dev_id in device_ids:
-                    device = await self.get_device(dev_id)
-                    if device:
-                        # Add the ID to the device object so we know which one it is
-                        device['id'] = dev_id 
-                        devices.append(device)
+        for dev_id in self._collect_device_ids(installations):
+            device = all_devices.get(dev_id)
+            if device:
+                device['id'] = dev_id
+                devices.append(device)
         return devices
 
     # --- SETTERS ---
@@ -178,19 +684,72 @@ class API:
     async def set_device_power(self, device_id, power_state: bool):
         """Update the power state."""
         # .update() in Pyrebase = PATCH in REST
-        path = f"devices/{device_id}/data"
-        payload = {"power": power_state}
-        return await self._request("PATCH", path, json_data=payload)
+        return await self._request("PATCH", _DATA_PATH(device_id), json_data={"power": power_state})
 
     async def set_device_temperature(self, device_id, temperature: int):
         """Update the temperature."""
-        path = f"devices/{device_id}/data"
-        payload = {"temp": temperature}
-        return await self._request("PATCH", path, json_data=payload)
+        return await self._request("PATCH", _DATA_PATH(device_id), json_data={"temp": temperature})
 
     async def set_device_mode(self, device_id, mode: str):
         """Set the device mode."""
-        path = f"devices/{device_id}/data"
-        payload = {"mode": mode}
-        return await self._request("PATCH", path, json_data=payload)
+        return await self._request("PATCH", _DATA_PATH(device_id), json_data={"mode": mode})
+
+    async def set_device_state(self, device_id, *, power: bool = None, temperature: int = None, mode: str = None):
+        """Update several properties at once with a single request. Properties left as None are not changed."""
+        payload = {
+            key: value
+            for key, value in (("power", power), ("temp", temperature), ("mode", mode))
+            if value is not None
+        }
+        if not payload:
+            return None
+        return await self._request("PATCH", _DATA_PATH(device_id), json_data=payload)
+
+
+# API instances returned by get_default_api, one per event loop since a session cannot outlive its loop
+_defaults = weakref.WeakKeyDictionary()
+_default_locks = weakref.WeakKeyDictionary()
+
+async def get_default_api(email, password):
+    """Return the shared API instance of the running event loop, creating and authenticating it on the first call.
+
+    Sharing one instance keeps a single sign-in, connection pool and cache for the whole process instead of
+    paying for them on every call. The credentials are only used by the call that creates the instance.
+    Each event loop gets its own instance, so a later asyncio.run() does not receive a session bound to a
+    closed loop. Returns None if authentication fails.
+    """
+    loop = asyncio.get_running_loop()
+    # Forget instances of loops that were closed without calling close_default_api
+    for other_loop in [other_loop for other_loop in _defaults if other_loop.is_closed()]:
+        del _defaults[other_loop]
+    api = _defaults.get(loop)
+    if api is not None:
+        return api
+
+    lock = _default_locks.setdefault(loop, asyncio.Lock())
+    async with lock:
+        if loop not in _defaults:
+            api = await API.create(email, password)
+            if await api.authenticate() is None:
+                await api.close()
+                return None
+            _defaults[loop] = api
+    return _defaults[loop]
+
+async def close_default_api():
+    """Close the shared API instance of the running event loop, if any.
+
+    Call it before the loop ends (e.g. at the end of the coroutine given to asyncio.run): the exit hook below
+    cannot close sessions whose loop is already closed, which is the case once asyncio.run() returns.
+    """
+    api = _defaults.pop(asyncio.get_running_loop(), None)
+    if api is not None:
+        await api.close()
 
+@atexit.register
+def _close_default_apis_at_exit():
+    # Only covers loops that are still open and idle at exit, e.g. ones driven with run_until_complete
+    for loop, api in list(_defaults.items()):
+        if not loop.is_closed() and not loop.is_running():
+            loop.run_until_complete(api.close())
+    _defaults.clear()
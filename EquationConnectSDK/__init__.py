@@ -1 +1 @@
-from .EquationConnectAPI import API
\ No newline at end of file
+from .EquationConnectAPI import API, get_default_api, close_default_api
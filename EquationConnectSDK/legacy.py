@@ -0,0 +1,49 @@
+import asyncio
+import inspect
+
+from .EquationConnectAPI import API, TOKEN_CACHE_PATH
+
+
+class AuthenticationError(Exception):
+    """Raised by SyncAPI when the credentials are rejected."""
+
+
+class SyncAPI:
+    """Blocking wrapper around the async API, for scripts and notebooks without an event loop.
+
+    It is not imported by the package on purpose: import it from EquationConnectSDK.legacy only when needed.
+    Every coroutine method of API is exposed as a regular method running on a private event loop, so the
+    same aiohttp session (and its connection pool) is reused across calls.
+
+    Raises AuthenticationError if the credentials are rejected.
+    """
+
+    def __init__(self, email, password, token_cache_path=TOKEN_CACHE_PATH):
+        self._loop = asyncio.new_event_loop()
+        # The session must be created while its event loop is running
+        self._api = self._loop.run_until_complete(API.create(email, password, token_cache_path))
+        if self._loop.run_until_complete(self._api.authenticate()) is None:
+            self.close()
+            raise AuthenticationError("Authentication failed, check the email and password.")
+
+    def __getattr__(self, name):
+        attr = getattr(self._api, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            return self._loop.run_until_complete(attr(*args, **kwargs))
+        return wrapper
+
+    def close(self):
+        """Close the underlying session and event loop."""
+        if self._loop.is_closed():
+            return
+        self._loop.run_until_complete(self._api.close())
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
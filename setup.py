@@ -11,12 +11,15 @@ setup(
     url="https://github.com/carlesibanez/Equation-Connect-SDK",
     packages=find_packages(),
     install_requires=[
-        "requests>=2.32.3",
+        "aiohttp>=3.8",
     ],
+    extras_require={
+        "speedups": ["orjson>=3.0", "aiodns>=3.0"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.8',
 )